@@ -5,7 +5,7 @@ urllib3.disable_warnings(InsecureRequestWarning)
 from .utils import *
 import json
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
 def get_networks(fabric: str, save_files: bool = False) -> List[Dict[str, Any]]:
     """Get networks for a specific fabric using NDFC API.
@@ -46,16 +46,40 @@ def create_network(fabric_name: str, network_payload: Dict[str, Any], template_p
     headers['Content-Type'] = 'application/json'
     
     # Convert template payload to JSON string if provided
-    template_config_str = json.dumps(template_payload) if template_payload else ""
+    template_config_str = prepare_api_payload(template_payload) if template_payload else ""
     
     # Create the final payload
     payload = network_payload.copy()
     payload["networkTemplateConfig"] = template_config_str
     
     url = get_url(f"/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{fabric_name}/networks")
-    r = requests.post(url, headers=headers, json=payload, verify=False)
+    r = requests.post(url, headers=headers, data=prepare_api_body(payload), verify=False)
     return check_status_code(r, operation_name="Create Network")
 
+def create_networks_bulk(fabric_name: str, network_payloads: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> bool:
+    """
+    Create several networks in a single request using the bulk-create endpoint.
+    
+    Args:
+        fabric_name: Name of the fabric
+        network_payloads: List of (network_payload, template_payload) tuples
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    headers = get_api_key_header()
+    headers['Content-Type'] = 'application/json'
+    
+    payload = []
+    for network_payload, template_payload in network_payloads:
+        network = network_payload.copy()
+        network["networkTemplateConfig"] = prepare_api_payload(template_payload) if template_payload else ""
+        payload.append(network)
+    
+    url = get_url("/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/bulk-create/networks")
+    r = requests.post(url, headers=headers, data=prepare_api_body(payload), verify=False)
+    return check_status_code(r, operation_name=f"Bulk Create {len(payload)} Networks in fabric {fabric_name}")
+
 def update_network(fabric_name: str, network_payload: Dict[str, Any], template_payload: Dict[str, Any]) -> bool:
     """
     Update a network using direct payload data.
@@ -72,7 +96,7 @@ def update_network(fabric_name: str, network_payload: Dict[str, Any], template_p
     headers['Content-Type'] = 'application/json'
     
     # Convert template payload to JSON string if provided
-    template_config_str = json.dumps(template_payload) if template_payload else ""
+    template_config_str = prepare_api_payload(template_payload) if template_payload else ""
     
     # Create the final payload
     payload = network_payload.copy()
@@ -80,7 +104,7 @@ def update_network(fabric_name: str, network_payload: Dict[str, Any], template_p
     
     network_name = network_payload.get('networkName')
     url = get_url(f"/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{fabric_name}/networks/{network_name}")
-    r = requests.put(url, headers=headers, json=payload, verify=False)
+    r = requests.put(url, headers=headers, data=prepare_api_body(payload), verify=False)
     return check_status_code(r, operation_name="Update Network")
 
 def delete_network(fabric_name: str, network_name: str) -> bool:
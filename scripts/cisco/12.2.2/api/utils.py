@@ -10,6 +10,11 @@ import requests
 import yaml
 from typing import Dict, Optional, Any
 
+try:
+    import orjson as _orjson  # Optional C-accelerated JSON encoder
+except ImportError:
+    _orjson = None
+
 def _load_fabric_builder_config() -> str:
     """
     Load NDFC IP from fabric_builder.yaml configuration file.
@@ -147,6 +152,7 @@ def validate_response_format(response: requests.Response, expected_format: str =
 def prepare_api_payload(data: Dict[str, Any]) -> str:
     """
     Prepare data for API request by converting to JSON string.
+    Uses orjson when it is installed and falls back to the standard library.
     
     Args:
         data: Dictionary to convert to JSON
@@ -158,11 +164,35 @@ def prepare_api_payload(data: Dict[str, Any]) -> str:
         ValueError: If data cannot be serialized to JSON
     """
     try:
+        if _orjson is not None:
+            return _orjson.dumps(data).decode('utf-8')
         import json
         return json.dumps(data)
     except (TypeError, ValueError) as e:
         raise ValueError(f"Failed to serialize data to JSON: {e}")
 
+def prepare_api_body(data: Any) -> bytes:
+    """
+    Encode data as a UTF-8 JSON request body for requests' data= argument.
+    Uses orjson when it is installed and falls back to the standard library.
+    
+    Args:
+        data: JSON-serializable request body (dict or list)
+        
+    Returns:
+        UTF-8 encoded JSON bytes
+        
+    Raises:
+        ValueError: If data cannot be serialized to JSON
+    """
+    try:
+        if _orjson is not None:
+            return _orjson.dumps(data)
+        import json
+        return json.dumps(data).encode('utf-8')
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Failed to serialize data to JSON: {e}")
+
 def handle_api_error(response: requests.Response, context: str = "API operation") -> None:
     """
     Enhanced error handling for API responses with detailed context.
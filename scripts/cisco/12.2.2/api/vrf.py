@@ -33,10 +33,10 @@ def create_vrf(fabric_name: str, vrf_payload: Dict[str, Any], template_payload:
         headers['Content-Type'] = 'application/json'
         
         # Convert template payload to JSON string
-        vrf_payload["vrfTemplateConfig"] = json.dumps(template_payload)
+        vrf_payload["vrfTemplateConfig"] = prepare_api_payload(template_payload)
         
         url = get_url(f"/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{fabric_name}/vrfs")
-        r = requests.post(url, headers=headers, json=vrf_payload, verify=False)
+        r = requests.post(url, headers=headers, data=prepare_api_body(vrf_payload), verify=False)
         return check_status_code(r, operation_name=f"Create VRF {vrf_payload.get('vrfName', 'unknown')}")
     except Exception as e:
         print(f"Error creating VRF {vrf_payload.get('vrfName', 'unknown')}: {e}")
@@ -60,11 +60,11 @@ def update_vrf(fabric_name: str, vrf_name: str, vrf_payload: Dict[str, Any], tem
         headers['Content-Type'] = 'application/json'
         
         # Convert template payload to JSON string
-        vrf_payload["vrfTemplateConfig"] = json.dumps(template_payload)
+        vrf_payload["vrfTemplateConfig"] = prepare_api_payload(template_payload)
         
         url = get_url(f"/appcenter/cisco/ndfc/api/v1/lan-fabric/rest/top-down/fabrics/{fabric_name}/vrfs/{vrf_name}")
         
-        r = requests.put(url, headers=headers, json=vrf_payload, verify=False)
+        r = requests.put(url, headers=headers, data=prepare_api_body(vrf_payload), verify=False)
         return check_status_code(r, operation_name=f"Update VRF {vrf_name}")
 
     except Exception as e:
@@ -20,8 +20,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'cisco', '12.2.2'))
 
 # Import all the manager classes from different modules
 from modules.fabric import FabricManager
-from modules.vrf import VRFManager  
-from modules.network import NetworkManager
+from modules.vrf import get_vrf_manager
+from modules.network import get_network_manager
 from modules.switch import SwitchManager
 from modules.interface import InterfaceManager
 from modules.vpc import VPCManager
@@ -35,8 +35,8 @@ class FabricBuilder:
     def __init__(self):
         """Initialize all manager instances."""
         self.fabric_manager = FabricManager()
-        self.vrf_manager = VRFManager()
-        self.network_manager = NetworkManager()
+        self.vrf_manager = get_vrf_manager()
+        self.network_manager = get_network_manager()
         self.switch_manager = SwitchManager()
         self.interface_manager = InterfaceManager()
         self.vpc_manager = VPCManager()
@@ -109,26 +109,29 @@ class FabricBuilder:
         switch_dir = os.path.join(self.get_root_dir(), 'network_configs', '3_node')
         
         if os.path.exists(switch_dir):
-            # Iterate through fabrics
-            for fabric_name in os.listdir(switch_dir):
-                fabric_path = os.path.join(switch_dir, fabric_name)
-                if os.path.isdir(fabric_path):
-                    switches[fabric_name] = {}
+            # Iterate through fabrics; DirEntry caches the file type, so no extra stat per entry
+            with os.scandir(switch_dir) as fabric_entries:
+                for fabric_entry in fabric_entries:
+                    if not fabric_entry.is_dir():
+                        continue
+                    switches[fabric_entry.name] = {}
                     
                     # Iterate through roles within each fabric
-                    for role_name in os.listdir(fabric_path):
-                        if role_name == "vpc":
-                            # Skip VPC directory since it is not a role
-                            continue
-                        role_path = os.path.join(fabric_path, role_name)
-                        if os.path.isdir(role_path):
-                            switches[fabric_name][role_name] = []
+                    with os.scandir(fabric_entry.path) as role_entries:
+                        for role_entry in role_entries:
+                            if role_entry.name == "vpc":
+                                # Skip VPC directory since it is not a role
+                                continue
+                            if not role_entry.is_dir():
+                                continue
                             
-                            # Iterate through node files within each role
-                            for node_file in os.listdir(role_path):
-                                if node_file.endswith('.yaml'):
-                                    node_name = node_file[:-5]  # Remove .yaml extension
-                                    switches[fabric_name][role_name].append(node_name)
+                            # Collect node files within each role
+                            with os.scandir(role_entry.path) as node_entries:
+                                switches[fabric_entry.name][role_entry.name] = [
+                                    node_entry.name[:-5]  # Remove .yaml extension
+                                    for node_entry in node_entries
+                                    if node_entry.name.endswith('.yaml')
+                                ]
         
         return switches
 
@@ -155,12 +158,14 @@ class FabricBuilder:
 
         # Add switches to fabrics
         print(f"{self.BOLD}{'=' * 20}Add switches to fabrics{'=' * 20}{self.END}")
+        # Parse every fabric's switch YAMLs up front; the per-switch steps below reuse them
+        for fabric_name in switches_data:
+            self.switch_manager.load_fabric(fabric_name)
+        # Each switch is discovered and given its role before the next one is added
         for fabric_name, roles in switches_data.items():
             for role_name, switches in roles.items():
                 for switch in switches:
-                    preserve_config = False
-                    if fabric_name in isn_list:
-                        preserve_config = True
+                    preserve_config = fabric_name in isn_list
                     self.switch_manager.discover_switch(fabric_name, role_name, switch, preserve_config=preserve_config)
                     self.switch_manager.set_switch_role(fabric_name, role_name, switch)
 
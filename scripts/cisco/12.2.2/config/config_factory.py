@@ -6,22 +6,27 @@ Provides configuration objects for different modules.
 Centralizes configuration creation and management.
 """
 
+from functools import lru_cache
+
 from .paths import project_paths
 
+class VRFConfig:
+    """Simple VRF configuration object holding the VRF file paths."""
+    def __init__(self, config_path, defaults_path, field_mapping_path):
+        self.config_path = config_path
+        self.defaults_path = defaults_path
+        self.field_mapping_path = field_mapping_path
+
 class ConfigFactory:
-    """Factory for creating configuration objects."""
+    """Factory for creating configuration objects.
+    Each configuration is built once per process and shared, so callers must treat it as read-only.
+    """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_vrf_config():
         """Create VRF configuration."""
         paths = project_paths.get_vrf_paths()
-        # Return simple configuration object instead of importing VRFConfig
-        class VRFConfig:
-            def __init__(self, config_path, defaults_path, field_mapping_path):
-                self.config_path = config_path
-                self.defaults_path = defaults_path
-                self.field_mapping_path = field_mapping_path
-        
         return VRFConfig(
             config_path=str(paths['configs']),
             defaults_path=str(paths['defaults']),
@@ -29,6 +34,7 @@ class ConfigFactory:
         )
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_switch_config():
         """Create switch configuration."""
         paths = project_paths.get_switch_paths()
@@ -41,6 +47,7 @@ class ConfigFactory:
         }
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_network_config():
         """Create network configuration."""
         paths = project_paths.get_network_paths()
@@ -51,6 +58,7 @@ class ConfigFactory:
         }
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_interface_config():
         """Create interface configuration."""
         paths = project_paths.get_interface_paths()
@@ -61,6 +69,7 @@ class ConfigFactory:
         }
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_vpc_config():
         """Create VPC configuration."""
         paths = project_paths.get_vpc_paths()
@@ -4,15 +4,111 @@ Contains YAML processing, config merging, and build-specific functions.
 Used by build_fabric.py for configuration processing.
 """
 import json
+import os
+import tempfile
+import threading
 import yaml
-from typing import Dict, Any, Optional, List, Tuple
-from pathlib import Path
+from collections import OrderedDict, defaultdict
+from typing import Dict, Any, Optional, List, Tuple, Union, BinaryIO
 
-def load_yaml_file(filepath: str) -> Optional[Dict[str, Any]]:
-    """Load a YAML file and return its content."""
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson as _orjson  # Optional C-accelerated JSON codec for sidecar files
+except ImportError:
+    _orjson = None
+
+# Parsed YAML per file path, reused while the file's (mtime, size) stamp is unchanged.
+# Bounded LRU: the least recently used entry is evicted past _YAML_CACHE_SIZE files.
+_YAML_CACHE_SIZE = 512
+_YAML_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+# Guards _YAML_CACHE for managers that load files from worker threads
+_YAML_CACHE_LOCK = threading.Lock()
+
+# Valid switch roles enum (immutable; lives here so managers can check roles without importing the switch module)
+VALID_SWITCH_ROLES = frozenset({
+    "leaf",
+    "spine", 
+    "super spine",
+    "border gateway",
+    "border gateway spine",
+    "border gateway super spine",
+    "core router",
+    "edge router",
+    "tor"
+})
+
+def _read_json_sidecar(sidecar_path: str, stamp: Tuple[int, int]) -> Tuple[bool, Any]:
+    """Return (True, data) if the sidecar was written for this exact YAML stamp, else (False, None)."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            return yaml.safe_load(file)
+        with open(sidecar_path, 'rb') as file:
+            raw = file.read()
+        sidecar = _orjson.loads(raw) if _orjson is not None else json.loads(raw)
+        if tuple(sidecar.get("stamp", ())) == stamp:
+            return True, sidecar.get("data")
+    except (OSError, ValueError, AttributeError):
+        pass
+    return False, None
+
+def _write_json_sidecar(sidecar_path: str, stamp: Tuple[int, int], data: Any) -> None:
+    """Atomically write parsed YAML as a JSON sidecar; skipped if JSON cannot represent it exactly."""
+    try:
+        content = {"stamp": list(stamp), "data": data}
+        encoded = json.dumps(content).encode('utf-8')
+        if json.loads(encoded)["data"] != data:
+            return  # e.g. non-string keys or dates would not round-trip
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(sidecar_path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(encoded)
+            os.replace(tmp_path, sidecar_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError):
+        pass  # The sidecar is only an optimization
+
+def load_yaml_file(filepath: Union[str, os.PathLike, BinaryIO], json_sidecar: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Load a YAML file and return its content.
+    Accepts a str or PathLike path, or an already open binary file object
+    (parsed directly, without caching).
+    Parsed content is cached per path until the file changes on disk,
+    so callers must treat the returned data as read-only.
+    With json_sidecar=True the parsed content is also persisted next to the
+    file as <file>.json and read from there by later processes while the
+    YAML file is unchanged.
+    """
+    try:
+        if hasattr(filepath, 'read'):
+            return yaml.load(filepath, Loader=_YamlLoader)
+        key = os.fspath(filepath)
+        stat = os.stat(key)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with _YAML_CACHE_LOCK:
+            cached = _YAML_CACHE.get(key)
+            if cached is not None and cached[0] == stamp:
+                _YAML_CACHE.move_to_end(key)
+                return cached[1]
+        found = False
+        if json_sidecar:
+            found, data = _read_json_sidecar(key + '.json', stamp)
+        if not found:
+            # Binary mode lets libyaml read and decode the bytes itself
+            with open(key, 'rb') as file:
+                data = yaml.load(file, Loader=_YamlLoader)
+            if json_sidecar:
+                _write_json_sidecar(key + '.json', stamp, data)
+        with _YAML_CACHE_LOCK:
+            _YAML_CACHE[key] = (stamp, data)
+            _YAML_CACHE.move_to_end(key)
+            if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+                _YAML_CACHE.popitem(last=False)
+        return data
     except FileNotFoundError:
         print(f"Error: YAML file not found at {filepath}")
         return None
@@ -87,6 +183,34 @@ def apply_field_mapping(config: Dict[str, Any], mapping: Dict[str, Any]) -> Dict
             mapped_config[key] = value
     return mapped_config
 
+def flatten_and_map(nested_config: Dict[str, Any], flat_mapping: Dict[str, Any], separator: str = '_') -> Dict[str, Any]:
+    """
+    Flatten a nested dictionary and apply an already flattened field mapping in one pass.
+    Same result as apply_field_mapping(flatten_config(nested_config), flat_mapping)
+    without building the intermediate flat dictionary.
+    """
+    if not isinstance(flat_mapping, dict):
+        return flatten_config(nested_config, separator=separator)
+    
+    mapped_config = {}
+    
+    def walk(config: Dict[str, Any], parent_key: str) -> None:
+        for key, value in config.items():
+            flat_key = f"{parent_key}{separator}{key}" if parent_key else key
+            if isinstance(value, dict):
+                walk(value, flat_key)
+            elif flat_key not in flat_mapping:
+                # Keep unmapped fields as-is
+                mapped_config[flat_key] = value
+            elif flat_mapping[flat_key] is not None:
+                if isinstance(value, str) and (".sh" in value or "Banner" in value):
+                    continue
+                mapped_config[flat_mapping[flat_key]] = value
+    
+    if isinstance(nested_config, dict):
+        walk(nested_config, '')
+    return mapped_config
+
 def get_nested_value(config_dict: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
     """
     Get a nested value from a dictionary using a tuple of keys.
@@ -103,27 +227,49 @@ def get_nested_value(config_dict: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
             return None
     return value
 
+def index_by_name_and_fabric(entries: List[Dict[str, Any]], name_key: str) -> Tuple[Dict[Any, Dict[str, Any]], Dict[Any, Tuple[Dict[str, Any], ...]]]:
+    """
+    Index resource entries (networks, VRFs) by name and by their 'Fabric' value.
+    The first entry wins for a repeated name; fabric groups keep file order.
+    """
+    by_name = {}
+    by_fabric = defaultdict(list)
+    for entry in entries:
+        by_name.setdefault(entry.get(name_key), entry)
+        by_fabric[entry.get('Fabric')].append(entry)
+    return by_name, {fabric: tuple(group) for fabric, group in by_fabric.items()}
+
 def validate_file_exists(filepath: str) -> bool:
     """Check if a file exists."""
-    return Path(filepath).exists()
+    return os.path.exists(filepath)
 
 def validate_configuration_files(file_paths: List[str]) -> Tuple[bool, List[str]]:
     """
     Validate that all required configuration files exist.
     Returns tuple of (all_exist, missing_files).
     """
-    missing_files = [f for f in file_paths if not Path(f).exists()]
+    missing_files = [f for f in file_paths if not os.path.exists(f)]
     return len(missing_files) == 0, missing_files
 
+# Freeform config text per file path, reused while the file's (mtime, size) stamp is unchanged
+_FREEFORM_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
 def read_freeform_config(file_path: str) -> str:
     """
     Read the content of a freeform configuration file.
     Handles special formatting for banner configurations.
+    Files shared by many switches are read once until they change on disk.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        key = os.fspath(file_path)
+        stat = os.stat(key)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = _FREEFORM_CACHE.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with open(key, 'r', encoding='utf-8') as f:
             content = f.read()
-            
+        _FREEFORM_CACHE[key] = (stamp, content)
         return content
     except FileNotFoundError:
         print(f"Warning: Freeform config file not found at {file_path}")
@@ -282,7 +282,7 @@ class FabricManager:
         defaults_config = load_yaml_file(defaults_path)
         field_mapping = load_yaml_file(field_mapping_path)
         
-        if not all([fabric_config, defaults_config, field_mapping]):
+        if fabric_config is None or defaults_config is None or field_mapping is None:
             raise ValueError("Could not load required configurations or mappings")
         
         # Build payload
@@ -32,7 +32,7 @@ class InterfaceManager:
 
     def _load_config(self, fabric_name: str, role: str, switch_name: str) -> Dict[str, Any]:
         """Load and validate switch configuration from YAML file."""
-        return load_yaml_file(str(self.switch_base_path / fabric_name / role / f"{switch_name}.yaml"))
+        return load_yaml_file(self.switch_base_path / fabric_name / role / f"{switch_name}.yaml")
 
     def check_interface_operation_status(self, fabric_name: str, role: str, switch_name: str) -> bool:
         """Check the operational status of interfaces for a switch."""
@@ -9,7 +9,7 @@ Provides YAML-based network management for Cisco NDFC:
 """
 
 # Import the NetworkManager from network.py
-from .network import NetworkManager
+from .network import NetworkManager, get_network_manager
 
-# --- Expose the NetworkManager class ---
-__all__ = ['NetworkManager']
+# --- Expose the NetworkManager class and shared instance ---
+__all__ = ['NetworkManager', 'get_network_manager']
@@ -10,15 +10,72 @@ This module provides a clean, unified interface for all network operations with:
 - Network attachment/detachment to switches (reads switch config for serial number, no interface parsing)
 """
 
-from typing import List, Dict, Any, Tuple, Optional
+import hashlib
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Tuple, Optional
 
 import api.network as network_api
-from modules.config_utils import load_yaml_file, validate_configuration_files
+from api.utils import get_management_ip
+from modules.config_utils import load_yaml_file, validate_configuration_files, index_by_name_and_fabric, VALID_SWITCH_ROLES
 from config.config_factory import config_factory
 
+# Corp defaults sections applied to the network template config
+_DEFAULT_SECTIONS = ("General Parameters", "Advanced")
+
+# Upper bound on concurrent NDFC requests issued by sync
+_SYNC_WORKERS = 8
+
+# Fingerprints of the last successful sync per fabric and controller
+_FINGERPRINT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "repo_fabric")
+
+# Static template config fields; per-network fields are layered on top of a copy
+_TEMPLATE_BASE = {
+    "type": "Normal",
+    "gatewayIpAddress": "",
+    "nveId": "1",
+    "tag": "12345",
+    "mcastGroup": "",
+    "switchRole": "",
+    "gen_address": "",
+    "isIpDhcpRelay": "",
+    "flagSet": "",
+    "vrfDhcp": "",
+    "dhcpServerAddr1": "",
+    "dhcpServerAddr2": "",
+    "dhcpServerAddr3": "",
+    "gen_mask": "",
+    "isIp6DhcpRelay": "",
+    "dhcpServers": ""
+}
+
+# Template config fields filled from each network's YAML entry
+_TEMPLATE_NETWORK_FIELDS = ("networkName", "vlanName", "vlanId", "intfDescription",
+                            "segmentId", "vrfName", "isLayer2Only")
+
+# Detach lanAttach entry prototype; copied per entry and filled with the switch fields
+_DETACH_ENTRY_PROTO = {
+    "fabric": None,
+    "networkName": None,
+    "serialNumber": None,
+    "vlan": -1,
+    "switchPorts": "",
+    "detachSwitchPorts": ""
+}
+
 class NetworkManager:
     """Unified network operations manager with YAML configuration support."""
+
+    __slots__ = (
+        'config_paths', 'switch_config_paths',
+        'defaults_path', 'field_mapping_path', 'config_path',
+        'defaults_path_str', 'field_mapping_path_str', 'config_path_str',
+        'switch_configs_dir_str',
+        '_networks', '_by_name', '_by_fabric', '_resources_validated',
+        '_template_defaults', '_template_names',
+        'GREEN', 'YELLOW', 'BOLD', 'END',
+    )
     
     def __init__(self):
         """Initialize with centralized configuration paths."""
@@ -27,10 +84,18 @@ class NetworkManager:
         self.defaults_path = self.config_paths['defaults_path']
         self.field_mapping_path = self.config_paths['field_mapping_path']
         self.config_path = self.config_paths['config_path']
+        # String forms of the resource paths, computed once for file loaders
+        self.defaults_path_str = str(self.defaults_path)
+        self.field_mapping_path_str = str(self.field_mapping_path)
+        self.config_path_str = str(self.config_path)
+        self.switch_configs_dir_str = str(self.switch_config_paths['configs_dir'])
         # Lazy-loaded cached configurations
-        self._defaults = None
-        self._field_mapping = None
         self._networks = None
+        self._by_name = {}
+        self._by_fabric = {}
+        self._resources_validated = False
+        self._template_defaults = None
+        self._template_names = None
 
         self.GREEN = '\033[92m'
         self.YELLOW = '\033[93m'
@@ -39,17 +104,13 @@ class NetworkManager:
 
     @property
     def defaults(self) -> Dict[str, Any]:
-        """Get corp defaults with lazy loading."""
-        if self._defaults is None:
-            self._defaults = load_yaml_file(str(self.defaults_path))
-        return self._defaults
+        """Get corp defaults; load_yaml_file reuses the parse until the file changes."""
+        return load_yaml_file(self.defaults_path_str)
     
     @property
     def field_mapping(self) -> Dict[str, Any]:
-        """Get field mapping with lazy loading."""
-        if self._field_mapping is None:
-            self._field_mapping = load_yaml_file(str(self.field_mapping_path))
-        return self._field_mapping
+        """Get field mapping; load_yaml_file reuses the parse until the file changes."""
+        return load_yaml_file(self.field_mapping_path_str)
     
     @property
     def networks(self) -> List[Dict[str, Any]]:
@@ -62,89 +123,95 @@ class NetworkManager:
         """Load network configurations from YAML file."""
         try:
             print(f"[Network] Loading network config from: {self.config_path}")
-            config_data = load_yaml_file(str(self.config_path))
+            config_data = load_yaml_file(self.config_path_str)
             self._networks = config_data.get('Network', [])
         except Exception as e:
             print(f"Error loading network configuration: {e}")
             self._networks = []
+        self._by_name, self._by_fabric = index_by_name_and_fabric(self._networks, 'Network Name')
+    
+    def fabric_networks(self, fabric_name: str) -> Tuple[Dict[str, Any], ...]:
+        """Get the YAML networks of a fabric from the index built at load time."""
+        if self._networks is None:
+            self._load_networks()
+        return self._by_fabric.get(fabric_name, ())
     
     def _get_network(self, network_name: str) -> Optional[Dict[str, Any]]:
         """Find network by name regardless of fabric."""
-        for net in self.networks:
-            if net.get('Network Name') == network_name:
-                return net
-        return None
+        if self._networks is None:
+            self._load_networks()
+        return self._by_name.get(network_name)
     
     def _get_effective_vrf(self, network: Dict[str, Any]) -> str:
         """Return VRF name, 'NA' if Layer 2 Only."""
         return "NA" if network.get('Layer 2 Only', False) else network.get('VRF Name', '')
     
     def _validate_resources(self) -> None:
-        """Validate required resource files exist."""
-        validate_configuration_files([str(self.defaults_path), str(self.field_mapping_path)])
+        """Validate required resource files exist (checked once per manager)."""
+        if self._resources_validated:
+            return
+        all_exist, _ = validate_configuration_files([self.defaults_path_str, self.field_mapping_path_str])
+        self._resources_validated = all_exist
     
-    def _build_network_template_config(self, network_name: str, network: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_network_template_config(self, network_name: str, network: Dict[str, Any], vrf_name: str) -> Dict[str, Any]:
         """Build network template configuration dictionary."""
         # Extract required fields from network data
+        layer2_only = network.get('Layer 2 Only', False)
+        gateway = network.get('IPv4 Gateway/NetMask', '')
         vlan_name = network.get('VLAN Name', '')
         vlan_id = str(network.get('VLAN ID', 0))
         intf_description = network.get('Interface Description', '')
         segment_id = str(network.get('Network ID', 0))
-        vrf_name = self._get_effective_vrf(network)
-        is_layer2_only = "true" if network.get('Layer 2 Only', False) else "false"
+        is_layer2_only = "true" if layer2_only else "false"
         
-        # Apply transformations - build base template config
+        # Apply transformations - static base, then per-network fields, then corp defaults
         template_config = {
+            **_TEMPLATE_BASE,
             "networkName": network_name,
             "vlanName": vlan_name,
             "vlanId": vlan_id,
             "intfDescription": intf_description,
             "segmentId": segment_id,
-            "type": "Normal",
             "vrfName": vrf_name,
             "isLayer2Only": is_layer2_only,
-            # Required fields with defaults
-            "gatewayIpAddress": "",
-            "nveId": "1",
-            "tag": "12345",
-            "mcastGroup": "",
-            "switchRole": "",
-            "gen_address": "",
-            "isIpDhcpRelay": "",
-            "flagSet": "",
-            "vrfDhcp": "",
-            "dhcpServerAddr1": "",
-            "dhcpServerAddr2": "",
-            "dhcpServerAddr3": "",
-            "gen_mask": "",
-            "isIp6DhcpRelay": "",
-            "dhcpServers": ""
+            **self._get_template_defaults(),
         }
         
-        # Apply corp defaults with field mapping
-        self._apply_template_defaults(template_config)
-        
         # Add gateway for Layer 3 networks
-        gateway = network.get('IPv4 Gateway/NetMask', '')
-        if gateway and not network.get('Layer 2 Only', False):
+        if gateway and not layer2_only:
             template_config["gatewayIpAddress"] = gateway
         
         return template_config
     
-    def _apply_template_defaults(self, template_config: Dict[str, Any]) -> None:
-        """Apply corp defaults with field mapping to template config."""
-        for section in ["General Parameters", "Advanced"]:
-            if section in self.defaults:
-                for key, value in self.defaults[section].items():
-                    mapped_field = self.field_mapping.get(section, {}).get(key, key)
-                    if mapped_field in template_config:
-                        template_config[mapped_field] = value
+    def _get_template_defaults(self) -> Dict[str, Any]:
+        """Return corp defaults mapped onto template config fields, computed once per manager."""
+        if self._template_defaults is None:
+            template_fields = set(_TEMPLATE_BASE).union(_TEMPLATE_NETWORK_FIELDS)
+            template_defaults = {}
+            for section in _DEFAULT_SECTIONS:
+                if section in self.defaults:
+                    section_mapping = self.field_mapping.get(section, {})
+                    for key, value in self.defaults[section].items():
+                        mapped_field = section_mapping.get(key, key)
+                        if mapped_field in template_fields:
+                            template_defaults[mapped_field] = value
+            self._template_defaults = template_defaults
+        return self._template_defaults
     
-    def _build_network_payload(self, fabric_name: str, network_name: str, network: Dict[str, Any]) -> Dict[str, Any]:
+    def _get_template_names(self) -> Tuple[str, str]:
+        """Return the (network, extension) template names from corp defaults, looked up once."""
+        if self._template_names is None:
+            self._template_names = (
+                self.defaults.get("networkTemplate", "Default_Network_Universal"),
+                self.defaults.get("networkExtensionTemplate", "Default_Network_Extension_Universal"),
+            )
+        return self._template_names
+    
+    def _build_network_payload(self, fabric_name: str, network_name: str, network: Dict[str, Any], vrf_name: str) -> Dict[str, Any]:
         """Build network payload dictionary."""
         # Extract required fields from network data
         network_id = network.get('Network ID', 0)
-        vrf_name = self._get_effective_vrf(network)
+        network_template, network_extension_template = self._get_template_names()
         vlan_name = network.get('VLAN Name', '')
         
         # Apply transformations - build base payload
@@ -153,21 +220,14 @@ class NetworkManager:
             "networkName": network_name,
             "displayName": network_name,
             "networkId": network_id,
-            "networkTemplate": self.defaults.get("networkTemplate", "Default_Network_Universal"),
-            "networkExtensionTemplate": self.defaults.get("networkExtensionTemplate", "Default_Network_Extension_Universal"),
+            "networkTemplate": network_template,
+            "networkExtensionTemplate": network_extension_template,
             "vrf": vrf_name,
             "vlanName": vlan_name,
             "type": "Normal",
             "hierarchicalKey": fabric_name,
-            # Additional fields for complete payload
-            "networkTemplateConfig": "",
-            "tenantName": None,
-            "serviceNetworkTemplate": None,
-            "source": None,
-            "interfaceGroups": None,
-            "primaryNetworkId": -1,
-            "primaryNetworkName": None,
-            "vlanId": None
+            # Null-valued optional fields are omitted; the API layer fills networkTemplateConfig
+            "primaryNetworkId": -1
         }
         
         return payload
@@ -180,24 +240,27 @@ class NetworkManager:
         if not network:
             raise ValueError(f"Network '{network_name}' not found in configuration")
         
+        # Both builders need the effective VRF; resolve it once
+        vrf_name = self._get_effective_vrf(network)
+        
         # Build network payload using dictionary approach
-        payload = self._build_network_payload(fabric_name, network_name, network)
+        payload = self._build_network_payload(fabric_name, network_name, network, vrf_name)
         
         # Build template config using dictionary approach
-        template_config = self._build_network_template_config(network_name, network)
+        template_config = self._build_network_template_config(network_name, network, vrf_name)
 
         # Return both payload and template config as dictionaries
         # The API layer will handle JSON encoding
         return payload, template_config
 
-    def _get_serial_number(self, fabric_name: str, role: str, switch_name: str) -> Optional[str]:
-        """Get the serial number of a switch in a fabric."""
-        switch_path = self.switch_config_paths['configs_dir'] / fabric_name / role / f"{switch_name}.yaml"
-        if not switch_path.exists():
+    def _load_switch_context(self, fabric_name: str, role: str, switch_name: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Load a switch's YAML once and return its (serial number, IP address), or None if unusable."""
+        switch_path = os.path.join(self.switch_configs_dir_str, fabric_name, role, switch_name + ".yaml")
+        if not os.path.exists(switch_path):
             print(f"[Network] Switch configuration not found: {switch_path}")
             return None
 
-        switch_config = load_yaml_file(str(switch_path))
+        switch_config = load_yaml_file(switch_path)
         if not switch_config:
             print(f"[Network] Failed to load switch configuration: {switch_path}")
             return None
@@ -207,7 +270,12 @@ class NetworkManager:
             print(f"[Network] No serial number found in switch configuration: {switch_name}")
             return None
 
-        return serial_number
+        return serial_number, switch_config.get('IP Address')
+
+    def _get_serial_number(self, fabric_name: str, role: str, switch_name: str) -> Optional[str]:
+        """Get the serial number of a switch in a fabric."""
+        context = self._load_switch_context(fabric_name, role, switch_name)
+        return context[0] if context else None
     
     # --- Network CRUD Operations ---
     
@@ -222,7 +290,7 @@ class NetworkManager:
             # print(f"[Network] Found {len(existing_network_names)} existing networks: {existing_network_names}")
             
             # Get networks from YAML config for this fabric
-            fabric_networks = [net for net in self.networks if net.get('Fabric') == fabric_name]
+            fabric_networks = self.fabric_networks(fabric_name)
             yaml_network_names = {net.get('Network Name') for net in fabric_networks}
             # print(f"[Network] Found {len(yaml_network_names)} networks in YAML: {yaml_network_names}")
             
@@ -230,32 +298,45 @@ class NetworkManager:
             networks_to_delete = existing_network_names - yaml_network_names
             # print(f"[Network] Networks to delete: {networks_to_delete if networks_to_delete else 'None'}")
             
-            # Find networks to create (exist in YAML but not in fabric)
-            networks_to_create = yaml_network_names - existing_network_names
+            # Split YAML networks in one pass: update if already in the fabric, otherwise create
+            networks_to_create, networks_to_update = [], []
+            for network_name in yaml_network_names:
+                (networks_to_update if network_name in existing_network_names else networks_to_create).append(network_name)
             # print(f"[Network] Networks to create: {networks_to_create if networks_to_create else 'None'}")
-            
-            # Find networks to update (exist in both fabric and YAML)
-            networks_to_update = existing_network_names.intersection(yaml_network_names)
             # print(f"[Network] Networks to update: {networks_to_update if networks_to_update else 'None'}")
             
+            # Nothing to do if the fabric already has exactly the YAML networks and
+            # neither they nor the defaults changed since the last successful sync
+            fingerprint = self._fabric_fingerprint(fabric_name, fabric_networks)
+            if not networks_to_delete and not networks_to_create and self._read_fingerprint(fabric_name) == fingerprint:
+                print(f"[Network] {self.GREEN}{self.BOLD}No changes for networks in fabric '{fabric_name}' since last sync{self.END}")
+                return True
+            
+            print(f"[Network] {len(networks_to_delete)} to delete, {len(networks_to_update)} to update, "
+                  f"{len(networks_to_create)} to create in fabric '{fabric_name}'")
             overall_success = True
+            # Forget the last sync before touching NDFC, so a partial sync is never mistaken for a complete one
+            self._clear_fingerprint(fabric_name)
             
-            # Delete unwanted networks
-            for network_name in networks_to_delete:
-                if not self.delete_network(fabric_name, network_name):
+            # Per-network calls are independent I/O, so overlap them; deletes
+            # finish before updates and creates start
+            with ThreadPoolExecutor(max_workers=_SYNC_WORKERS) as executor:
+                # Delete unwanted networks
+                results = list(executor.map(lambda n: self.delete_network(fabric_name, n), networks_to_delete))
+                if not all(results):
                     overall_success = False
-    
-            # Update existing networks
-            for network_name in networks_to_update:
-                if not self.update_network(fabric_name, network_name):
+
+                # Update existing networks
+                results = list(executor.map(lambda n: self.update_network(fabric_name, n), networks_to_update))
+                if not all(results):
                     overall_success = False
 
             # Create missing networks
-            for network_name in networks_to_create:
-                if not self.create_network(fabric_name, network_name):
-                    overall_success = False
+            if not self._create_networks_bulk(fabric_name, networks_to_create):
+                overall_success = False
 
             if overall_success:
+                self._write_fingerprint(fabric_name, fingerprint)
                 print(f"[Network] {self.GREEN}{self.BOLD}Successfully synchronized all networks in fabric '{fabric_name}'{self.END}")
             else:
                 print(f"[Network] {self.YELLOW}{self.BOLD}Network synchronization completed with some errors in fabric '{fabric_name}'{self.END}")
@@ -266,16 +347,65 @@ class NetworkManager:
             print(f"[Network] Error updating networks: {e}")
             return False
     
-    def create_network(self, fabric_name: str, network_name: str) -> bool:
-        """Create a network using YAML configuration."""
+    def _fabric_fingerprint(self, fabric_name: str, fabric_networks: Tuple[Dict[str, Any], ...]) -> str:
+        """Hash the fabric's YAML networks together with the target controller, defaults and field mapping."""
+        content = {
+            "controller": get_management_ip(),
+            "fabric": fabric_name,
+            "networks": fabric_networks,
+            "defaults": self.defaults,
+            "field_mapping": self.field_mapping,
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    
+    def _fingerprint_path(self, fabric_name: str) -> str:
+        """Path of the stored sync fingerprint for a fabric."""
+        return os.path.join(_FINGERPRINT_DIR, f"{fabric_name}.fp")
+    
+    def _read_fingerprint(self, fabric_name: str) -> Optional[str]:
+        """Read the fingerprint of the last successful sync, or None if there is none."""
+        try:
+            with open(self._fingerprint_path(fabric_name), 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    
+    def _clear_fingerprint(self, fabric_name: str) -> None:
+        """Remove the stored fingerprint so the next sync runs in full."""
+        try:
+            os.remove(self._fingerprint_path(fabric_name))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[Network] Could not clear sync fingerprint for fabric '{fabric_name}': {e}")
+    
+    def _write_fingerprint(self, fabric_name: str, fingerprint: str) -> None:
+        """Store the fingerprint after a successful sync; failures only cost a full sync next time."""
+        try:
+            os.makedirs(_FINGERPRINT_DIR, exist_ok=True)
+            with open(self._fingerprint_path(fabric_name), 'w', encoding='utf-8') as f:
+                f.write(fingerprint)
+        except OSError as e:
+            print(f"[Network] Could not save sync fingerprint for fabric '{fabric_name}': {e}")
+    
+    def create_network(self, fabric_name: str, network_name: str,
+                       existing_network_names: Optional[set] = None) -> bool:
+        """Create a network using YAML configuration.
+
+        Callers that already fetched the fabric's networks (e.g. sync) can pass
+        existing_network_names to skip the extra lookup.
+        """
         print(f"[Network] {self.GREEN}Creating network '{network_name}' in fabric '{fabric_name}'{self.END}")
 
         try:
             # Check if network already exists
-            existing_networks = network_api.get_networks(fabric_name)
-            existing_network_names = {net.get('networkName') for net in existing_networks}
+            if existing_network_names is not None:
+                exists = network_name in existing_network_names
+            else:
+                existing_networks = network_api.get_networks(fabric_name)
+                exists = any(net.get('networkName') == network_name for net in existing_networks)
             
-            if network_name in existing_network_names:
+            if exists:
                 print(f"[Network] Network '{network_name}' already exists in fabric '{fabric_name}', skipping creation")
                 return True
             
@@ -286,6 +416,27 @@ class NetworkManager:
             print(f"[Network] Error creating network '{network_name}': {e}")
             return False
     
+    def _create_networks_bulk(self, fabric_name: str, network_names: List[str]) -> bool:
+        """Create networks with one bulk request, falling back to per-network creation on failure."""
+        if not network_names:
+            return True
+        print(f"[Network] {self.GREEN}Creating {len(network_names)} network(s) in fabric '{fabric_name}'{self.END}")
+        try:
+            payloads = [self._build_complete_payload(fabric_name, network_name) for network_name in network_names]
+            if network_api.create_networks_bulk(fabric_name, payloads):
+                return True
+        except Exception as e:
+            print(f"[Network] Error creating networks in bulk: {e}")
+
+        print(f"[Network] {self.YELLOW}Bulk create failed, creating networks one by one{self.END}")
+        # Re-read the fabric so networks created before the bulk request failed are skipped
+        existing_network_names = {net.get('networkName') for net in network_api.get_networks(fabric_name)}
+        overall_success = True
+        for network_name in network_names:
+            if not self.create_network(fabric_name, network_name, existing_network_names):
+                overall_success = False
+        return overall_success
+    
     def update_network(self, fabric_name: str, network_name: str) -> bool:
         """Update a network using YAML configuration."""
         print(f"[Network] {self.GREEN}Updating network '{network_name}' in fabric '{fabric_name}'{self.END}")
@@ -296,7 +447,6 @@ class NetworkManager:
     def delete_network(self, fabric_name: str, network_name: str) -> bool:
         """Delete a network after detaching from all switches."""
         print(f"[Network] {self.YELLOW}Deleting network '{network_name}' in fabric '{fabric_name}'{self.END}")
-        print(f"[Network] Trying to detach '{network_name}' from all switches in fabric '{fabric_name}' before deletion")
         if not self._detach_network_by_serial_number(fabric_name, network_name):
             print(f"[Network] Failed to detach '{network_name}' from all switches in fabric '{fabric_name}', aborting deletion")
             return False
@@ -305,50 +455,41 @@ class NetworkManager:
     def _detach_network_by_serial_number(self, fabric_name: str, network_name: str, serial_number: str = None) -> bool:
         """Detach a network from a switch by serial number."""
         network_attachments = network_api.get_network_attachment(fabric_name, save_files=False)
-        detach_data = []
+        payload = self._build_detach_payload(fabric_name, network_attachments, serial_number)
+        if not payload:
+            return True
+
+        return network_api.detach_network(fabric_name, payload)
+    
+    def _build_detach_payload(self, fabric_name: str, network_attachments: List[Dict[str, Any]],
+                              serial_number: Optional[str]) -> List[Dict[str, Any]]:
+        """Build detach payload for attached networks on a switch in a single pass over the attachments.
+
+        Attachments are grouped per network (one payload entry with all of its lanAttach
+        records) and deduplicated per switch serial number within each network.
+        """
+        per_network: Dict[str, Dict[Optional[str], Dict[str, Any]]] = {}
         for attachment in network_attachments:
-            lan_attach_list = attachment.get('lanAttachList', [])
-            for lan_attach in lan_attach_list:
+            for lan_attach in attachment.get('lanAttachList', []):
                 if lan_attach.get('switchSerialNo') != serial_number:
                     continue
                 if not lan_attach.get('isLanAttached'):
                     continue
                 network_name = lan_attach.get('networkName', 'unknown')
-                detach_data.append({
-                    'network_name': network_name,
-                    'serial_number': serial_number,
-                    'vlan_id': lan_attach.get('vlanId', -1),
-                })
-        payload = self._build_detach_payload(fabric_name, detach_data)
-        if not payload:
-            print(f"[Network] No networks to detach from switch ({serial_number}) in fabric '{fabric_name}'")
-            return True
+                lan_attach_entries = per_network.setdefault(network_name, {})
+                if serial_number in lan_attach_entries:
+                    continue
+                entry = _DETACH_ENTRY_PROTO.copy()
+                entry["fabric"] = fabric_name
+                entry["networkName"] = network_name
+                entry["serialNumber"] = serial_number
+                entry["vlan"] = lan_attach.get('vlanId', -1)
+                lan_attach_entries[serial_number] = entry
 
-        return network_api.detach_network(fabric_name, payload)
-    
-    def _build_detach_payload(self, fabric_name: str, detach_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Build detach payload from normalized data structure."""
-        payload = []
-        for data in detach_data:
-            network_name = data['network_name']
-            serial_number = data['serial_number']
-            vlan_id = data['vlan_id']
-            
-            network_payload = {
-                "networkName": network_name,
-                "lanAttachList": [{
-                    "fabric": fabric_name,
-                    "networkName": network_name,
-                    "serialNumber": serial_number,
-                    "vlan": vlan_id,
-                    "switchPorts": "",
-                    "detachSwitchPorts": "",
-                }]
-            }
-            payload.append(network_payload)
-            # print(f"[Network] Added network '{network_name}' on switch (SN: {serial_number}, VLAN: {vlan_id}) to detach payload")
-        
-        return payload
+        return [
+            {"networkName": network_name, "lanAttachList": list(entries.values())}
+            for network_name, entries in per_network.items()
+        ]
     
     # --- Network Attachment Operations ---
     
@@ -366,16 +507,16 @@ class NetworkManager:
     def attach_networks(self, fabric_name: str, role: str, switch_name: str) -> bool:
         """Attach all networks to a device based on YAML configuration."""
         print(f"[Network] {self.GREEN}Attaching networks to switch '{switch_name}' ({role}) in fabric '{fabric_name}'{self.END}")
+        if role not in VALID_SWITCH_ROLES:
+            print(f"[Network] Invalid switch role '{role}' for switch '{switch_name}'")
+            return False
         try:
             # Load switch configuration to get serial number and IP
-            serial_number = self._get_serial_number(fabric_name, role, switch_name)
-            if not serial_number:
+            context = self._load_switch_context(fabric_name, role, switch_name)
+            if not context:
                 print(f"[Network] No serial number found for switch '{switch_name}'")
                 return False
-            
-            switch_path = self.switch_config_paths['configs_dir'] / fabric_name / role / f"{switch_name}.yaml"
-            switch_config = load_yaml_file(str(switch_path))
-            switch_ip = switch_config.get('IP Address')
+            serial_number, switch_ip = context
             
             if not switch_ip:
                 print(f"[Network] Error: IP Address not found in switch configuration")
@@ -387,24 +528,17 @@ class NetworkManager:
                 print(f"[Network] No networks found for fabric '{fabric_name}'")
                 return True  # No networks to process is considered success
             
-            # Build payload for all networks
-            payload = []
-            for attachment in attachments:
-                network_name = attachment.get('networkName')
-
-                if network_name:
-                    network_payload = {
-                        "networkName": network_name,
-                        "switchName": switch_name,
-                        "switchIP": switch_ip,
-                        "switchSN": serial_number,
-                        "allSwitches": [switch_name]
-                    }
-                    payload.append(network_payload)
-                    # print(f"[Network] Added network '{network_name}' to attach payload")
+            # Build payload for all networks; the switch fields are the same for every entry
+            switch_fields = {"switchName": switch_name, "switchIP": switch_ip, "switchSN": serial_number}
+            payload = [
+                {"networkName": network_name, **switch_fields, "allSwitches": [switch_name]}
+                for network_name in (attachment.get('networkName') for attachment in attachments)
+                if network_name
+            ]
             if not payload:
                 print(f"[Network] No valid networks to attach")
                 return True
+            print(f"[Network] Prepared {len(payload)} attach entries for switch '{switch_name}'")
             
             # Call API with complete payload
             return network_api.attach_network(payload)
@@ -416,29 +550,19 @@ class NetworkManager:
     def detach_networks(self, fabric_name: str, role: str, switch_name: str) -> bool:
         """Detach networks that are currently attached in the NDFC by given switch."""
         print(f"[Network] {self.YELLOW}Detaching networks from switch '{switch_name}' ({role}) in fabric '{fabric_name}'{self.END}")
+        if role not in VALID_SWITCH_ROLES:
+            print(f"[Network] Invalid switch role '{role}' for switch '{switch_name}'")
+            return False
         try:
             # Load and validate switch configuration
-            serial_number = self._get_serial_number(fabric_name, role, switch_name)
-            if not serial_number:
+            context = self._load_switch_context(fabric_name, role, switch_name)
+            if not context:
                 print(f"[Network] No serial number found for switch '{switch_name}'")
                 return False
+            serial_number = context[0]
             
             network_attachments = network_api.get_network_attachment(fabric_name, save_files=False)
-            detach_data = []
-            for attachment in network_attachments:
-                lan_attach_list = attachment.get('lanAttachList', [])
-                for lan_attach in lan_attach_list:
-                    if lan_attach.get('switchSerialNo') != serial_number:
-                        continue
-                    if not lan_attach.get('isLanAttached'):
-                        continue
-                    network_name = lan_attach.get('networkName', 'unknown')
-                    detach_data.append({
-                        'network_name': network_name,
-                        'serial_number': serial_number,
-                        'vlan_id': lan_attach.get('vlanId', -1),
-                    })
-            payload = self._build_detach_payload(fabric_name, detach_data)
+            payload = self._build_detach_payload(fabric_name, network_attachments, serial_number)
             if not payload:
                 print(f"[Network] No networks to detach from switch ({serial_number}) in fabric '{fabric_name}'")
                 return True
@@ -448,3 +572,13 @@ class NetworkManager:
         except Exception as e:
             print(f"[Network] Error detaching unwanted networks from switch '{switch_name}': {e}")
             return False
+
+# Shared manager instance so callers in one process reuse the loaded YAML
+_network_manager: Optional[NetworkManager] = None
+
+def get_network_manager() -> NetworkManager:
+    """Return the process-wide NetworkManager, creating it on first use."""
+    global _network_manager
+    if _network_manager is None:
+        _network_manager = NetworkManager()
+    return _network_manager
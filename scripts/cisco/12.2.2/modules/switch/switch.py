@@ -11,29 +11,51 @@ This module provides a clean, unified interface for all switch operations with:
 """
 
 import os
-from typing import Dict, Any, Optional
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from pathlib import Path
-import paramiko
 import time
+from dotenv import load_dotenv
 
 import api.switch as switch_api
 import api.policy as policy_api
-from modules.config_utils import load_yaml_file, read_freeform_config
+from modules.config_utils import load_yaml_file, read_freeform_config, VALID_SWITCH_ROLES
 from config.config_factory import config_factory
 
-# Valid switch roles enum
-VALID_SWITCH_ROLES = {
-    "leaf",
-    "spine", 
-    "super spine",
-    "border gateway",
-    "border gateway spine",
-    "border gateway super spine",
-    "core router",
-    "edge router",
-    "tor"
+# .env holding SWITCH_PASSWORD, resolved once at import (scripts/cisco/12.2.2/api/.env)
+_ENV_PATH = Path(__file__).resolve().parents[2] / "api" / ".env"
+load_dotenv(_ENV_PATH)
+_SWITCH_PASSWORD = os.getenv("SWITCH_PASSWORD")
+
+# Roles in a stable order for the invalid-role error message
+_SORTED_VALID_ROLES = tuple(sorted(VALID_SWITCH_ROLES))
+
+# Required discovery fields read from a switch YAML in one call
+_SWITCH_FIELDS = itemgetter("IP Address", "Serial Number", "Platform")
+
+# Default number of switches handled concurrently by the batch operations
+_BATCH_WORKERS = 8
+
+# Longest wait for the IP change command to report completion over SSH (seconds)
+_SSH_COMMAND_WAIT = 2
+
+# Discovery payload skeleton; copied per switch and filled with the seed IP and switch data
+_DISCOVERY_TEMPLATE = {
+    "seedIP": "",
+    "username": "admin",
+    "password": "",  # Will be filled from environment
+    "maxHops": 0,
+    "preserveConfig": False,
+    "switches": None,
+    "platform": "null"
 }
 
+# Switch YAML data paired with its serial number, as returned by SwitchManager._resolve
+_SwitchCtx = namedtuple("_SwitchCtx", "data serial")
+
 class SwitchManager:
     """Unified switch operations manager with YAML configuration support."""
     
@@ -41,44 +63,83 @@ class SwitchManager:
         """Initialize with centralized configuration paths."""
         self.config_paths = config_factory.create_switch_config()
         self.config_base_path = self.config_paths['configs_dir']
+        # String form of the base path for os.path.join in per-switch lookups
+        self.config_base_str = str(self.config_base_path)
         self.GREEN = '\033[92m'
         self.YELLOW = '\033[93m'
         self.BOLD = '\033[1m'
         self.END = '\033[0m'
 
-    def _validate_switch_role(self, role: str) -> bool:
-        """Validate if the role is in the allowed enum values."""
-        role_lower = role.lower().strip()
+    def _normalize_switch_role(self, role: str) -> Optional[str]:
+        """Return the role in its API form (lowercase, stripped), or None if it is not an allowed enum value."""
+        # Roles from YAML and directory names are usually already normalized
+        if role in VALID_SWITCH_ROLES:
+            return role
+        role_lower = role.lower().strip() if role else ""
         if role_lower not in VALID_SWITCH_ROLES:
             print(f"Error: Invalid switch role '{role}'. Valid roles are:")
-            for valid_role in sorted(VALID_SWITCH_ROLES):
+            for valid_role in _SORTED_VALID_ROLES:
                 print(f"  - {valid_role}")
-            return False
-        return True
+            return None
+        return role_lower
     
     def _load_switch_config(self, fabric_name: str, role: str, switch_name: str) -> Optional[Dict[str, Any]]:
         """Load switch configuration from YAML file."""
-        config_path = self.config_base_path / fabric_name / role / f"{switch_name}.yaml"
+        config_path = os.path.join(self.config_base_str, fabric_name, role, switch_name + ".yaml")
+        # load_yaml_file stats the file for its cache check and reports a missing file itself
+        return load_yaml_file(config_path, json_sidecar=True)
+    
+    def _resolve(self, fabric_name: str, role: str, switch_name: str) -> Optional[_SwitchCtx]:
+        """Load a switch's configuration and serial number, logging the error and returning None if either is missing."""
+        switch_data = self._load_switch_config(fabric_name, role, switch_name)
+        if not switch_data:
+            return None
         
-        if not config_path.exists():
-            print(f"Switch configuration not found: {config_path}")
+        serial_number = switch_data.get("Serial Number")
+        if not serial_number:
+            print(f"[Switch] Error: Serial Number not found in {switch_name} configuration")
             return None
-        return load_yaml_file(str(config_path))
+        return _SwitchCtx(switch_data, serial_number)
+    
+    def load_fabric(self, fabric_name: str, max_workers: int = 16) -> int:
+        """Parse all switch YAMLs of a fabric in parallel so later per-switch loads hit the cache.
+        
+        Returns the number of switch configurations loaded.
+        """
+        fabric_dir = os.path.join(self.config_base_str, fabric_name)
+        yaml_paths = []
+        try:
+            with os.scandir(fabric_dir) as role_entries:
+                for role_entry in role_entries:
+                    # The vpc directory holds pair definitions, not switches
+                    if role_entry.name == "vpc" or not role_entry.is_dir():
+                        continue
+                    with os.scandir(role_entry.path) as file_entries:
+                        yaml_paths.extend(
+                            file_entry.path for file_entry in file_entries
+                            if file_entry.name.endswith('.yaml') and file_entry.is_file()
+                        )
+        except OSError as e:
+            print(f"[Switch] Error scanning fabric directory {fabric_dir}: {e}")
+            return 0
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            loaded = list(executor.map(lambda path: load_yaml_file(path, json_sidecar=True), yaml_paths))
+        return sum(1 for data in loaded if data is not None)
     
-    def _extract_model_name(self, platform: str) -> str:
-        """Extract model name from platform string."""
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _extract_model_name(platform: str) -> str:
+        """Extract model name from platform string (switches commonly share a platform)."""
         # Extract model from platform (e.g., "N9K-C9300v" -> "N9K")
-        if "-" in platform:
-            return platform.split("-")[0]
-        return platform
+        idx = platform.find("-")
+        return platform[:idx] if idx >= 0 else platform
     
     def _build_switch_config(self, fabric_name: str, role: str, switch_name: str, 
                            switch_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Build switch config dictionary from YAML data."""
+        """Build switch config dictionary from YAML data; raises KeyError naming a missing required field."""
         # Extract required fields from switch_data
-        ip_address = switch_data.get("IP Address", "")
-        serial_number = switch_data.get("Serial Number", "")
-        platform = switch_data.get("Platform", "")
+        ip_address, serial_number, platform = _SWITCH_FIELDS(switch_data)
         version = switch_data.get("Version", "9.3(15)")  # Default version if not specified
         
         # Apply transformations
@@ -93,12 +154,7 @@ class SwitchManager:
             "ip_address": ip_address,
             "platform": platform,
             "version": version,
-            "device_index": device_index,
-            # API format fields
-            "sysName": switch_name,
-            "serialNumber": serial_number,
-            "ipaddr": ip_address,
-            "deviceIndex": device_index
+            "device_index": device_index
         }
     
     def _build_discovery_payload(self, switch_config: Dict[str, Any], preserve_config: bool = False) -> Dict[str, Any]:
@@ -115,15 +171,11 @@ class SwitchManager:
         }
         
         # Build and return the payload structure
-        return {
-            "seedIP": seed_ip,
-            "username": "admin",
-            "password": "",  # Will be filled from environment
-            "maxHops": 0,
-            "preserveConfig": preserve_config,
-            "switches": [switch_api_data],
-            "platform": "null"
-        }
+        payload = _DISCOVERY_TEMPLATE.copy()
+        payload["seedIP"] = seed_ip
+        payload["preserveConfig"] = preserve_config
+        payload["switches"] = [switch_api_data]
+        return payload
     
     def discover_switch(self, fabric_name: str, role: str, switch_name: str, preserve_config: bool = False) -> bool:
         """Discover switch based on YAML configuration."""
@@ -138,7 +190,11 @@ class SwitchManager:
         if not switch_data:
             return False
         
-        switch_config = self._build_switch_config(fabric_name, role, switch_name, switch_data)
+        try:
+            switch_config = self._build_switch_config(fabric_name, role, switch_name, switch_data)
+        except KeyError as e:
+            print(f"[Switch] Error: Switch {switch_name} configuration is missing required field {e}")
+            return False
         payload = self._build_discovery_payload(switch_config, preserve_config)
         
         return switch_api.discover_switch(fabric_name, payload)
@@ -147,59 +203,85 @@ class SwitchManager:
         """Delete switch based on YAML configuration."""
         print(f"[Switch] {self.YELLOW}{self.BOLD}Deleting switch {switch_name} from fabric {fabric_name}{self.END}")
         
-        switch_data = self._load_switch_config(fabric_name, role, switch_name)
-        if not switch_data:
-            return False
-        
-        serial_number = switch_data.get("Serial Number")
-        if not serial_number:
-            print(f"[Switch] Error: Serial Number not found in {switch_name} configuration")
+        ctx = self._resolve(fabric_name, role, switch_name)
+        if not ctx:
             return False
+        serial_number = ctx.serial
         return switch_api.delete_switch(fabric_name, serial_number)
     
     def set_switch_role(self, fabric_name: str, role: str, switch_name: str) -> bool:
         """Set switch role based on YAML configuration."""
-        switch_data = self._load_switch_config(fabric_name, role, switch_name)
-        if not switch_data:
-            return False
-        
-        serial_number = switch_data.get("Serial Number")
-        switch_role = switch_data.get("Role")
-        
-        if not serial_number:
-            print(f"[Switch] Error: Serial Number not found in {switch_name} configuration")
+        ctx = self._resolve(fabric_name, role, switch_name)
+        if not ctx:
             return False
+        serial_number = ctx.serial
+        switch_role = ctx.data.get("Role")
         
         if not switch_role:
             print(f"[Switch] Error: Role not found in {switch_name} configuration")
             return False
         
-        if not self._validate_switch_role(switch_role):
+        switch_role_lower = self._normalize_switch_role(switch_role)
+        if not switch_role_lower:
             print(f"[Switch] Error: Invalid role '{switch_role}' for switch {switch_name}")
             return False
         
-        switch_role_lower = switch_role.lower().strip()
         print(f"[Switch] {self.GREEN}Setting role for switch '{switch_name}' to '{switch_role_lower}'{self.END}")
 
         return switch_api.set_switch_role(serial_number, switch_role_lower)
     
+    # --- Batch Operations ---
+    
+    def _run_batch(self, operation: Callable[..., bool], switches: List[Tuple[str, ...]],
+                   max_workers: int, *args) -> Dict[Tuple[str, ...], bool]:
+        """Run operation(*entry, *args) for each (fabric, role, switch, ...) entry on a thread pool."""
+        results = {}
+        if not switches:
+            return results
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(operation, *switch, *args): switch for switch in switches}
+            for future in as_completed(futures):
+                switch = futures[future]
+                try:
+                    results[switch] = future.result()
+                except Exception as e:
+                    print(f"[Switch] Error processing switch {switch[2]}: {e}")
+                    results[switch] = False
+        return results
+    
+    def discover_switches(self, switches: List[Tuple[str, str, str]], preserve_config: bool = False,
+                          max_workers: int = _BATCH_WORKERS) -> Dict[Tuple[str, str, str], bool]:
+        """Discover several (fabric, role, switch) entries concurrently."""
+        return self._run_batch(self.discover_switch, switches, max_workers, preserve_config)
+    
+    def delete_switches(self, switches: List[Tuple[str, str, str]],
+                        max_workers: int = _BATCH_WORKERS) -> Dict[Tuple[str, str, str], bool]:
+        """Delete several (fabric, role, switch) entries concurrently."""
+        return self._run_batch(self.delete_switch, switches, max_workers)
+    
+    def set_switch_roles(self, switches: List[Tuple[str, str, str]],
+                         max_workers: int = _BATCH_WORKERS) -> Dict[Tuple[str, str, str], bool]:
+        """Set the roles of several (fabric, role, switch) entries concurrently."""
+        return self._run_batch(self.set_switch_role, switches, max_workers)
+
+    def change_switch_ips(self, changes: List[Tuple[str, str, str, str, str]],
+                          max_workers: int = _BATCH_WORKERS) -> Dict[Tuple[str, str, str, str, str], bool]:
+        """Change several (fabric, role, switch, original_ip, new_ip) entries concurrently, one SSH session each."""
+        return self._run_batch(self.change_switch_ip, changes, max_workers)
+
     def change_switch_ip(self, fabric_name: str, role: str, switch_name: str, 
                         original_ip: str, new_ip: str) -> bool:
         """Change switch management IP through SSH and update NDFC."""
         print(f"[Switch] Changing IP for switch {switch_name} from {original_ip} to {new_ip}")
         
-        switch_data = self._load_switch_config(fabric_name, role, switch_name)
-        if not switch_data:
-            return False
-        
-        serial_number = switch_data.get("Serial Number")
-        if not serial_number:
-            print(f"[Switch] Error: Serial Number not found in {switch_name} configuration")
+        ctx = self._resolve(fabric_name, role, switch_name)
+        if not ctx:
             return False
+        serial_number = ctx.serial
         
-        original_ip_only = original_ip.split('/')[0]
+        original_ip_only = original_ip.partition('/')[0]
         new_ip_with_mask = new_ip
-        new_ip_only = new_ip.split('/')[0]
+        new_ip_only = new_ip.partition('/')[0]
         
         if not self._ssh_change_management_ip(original_ip_only, new_ip_with_mask):
             return False
@@ -210,60 +292,70 @@ class SwitchManager:
         print(f"[Switch] Successfully changed IP for switch {switch_name}")
         return True
     
+    def _get_ssh(self, host: str, password: str, username: str = "admin") -> Any:
+        """Open an SSH client to host; the caller closes it."""
+        # paramiko is only needed for SSH, so import it on first use
+        import paramiko
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        print(f"[*] Connecting to {host}")
+        # Password auth only; skip agent and key file attempts and bound the
+        # banner/auth phases so a slow switch CPU fails fast instead of hanging
+        ssh.connect(host, username=username, password=password, timeout=30,
+                    allow_agent=False, look_for_keys=False,
+                    banner_timeout=10, auth_timeout=10, compress=False)
+        return ssh
+    
     def _ssh_change_management_ip(self, original_ip: str, new_ip_with_mask: str) -> bool:
         """SSH to switch and change management IP address."""
+        ssh = None
         try:
-            # Load environment for password from the correct path
-            from dotenv import load_dotenv
-            # Go to the script directory and then to api/.env
-            script_dir = Path(__file__).resolve().parents[2]  # Go up to scripts/cisco/12.2.2/
-            env_path = script_dir / "api" / ".env"
-            load_dotenv(env_path)
-            password = os.getenv("SWITCH_PASSWORD")
-            
+            password = self._get_switch_password()
             if not password:
-                print("Error: SWITCH_PASSWORD not found in environment")
-                print(f"Please check .env file at: {env_path}")
                 return False
             
             # SSH connection
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            print(f"[*] Connecting to {original_ip}")
-            ssh.connect(original_ip, username="admin", password=password, timeout=30)
+            ssh = self._get_ssh(original_ip, password)
             
             # Execute IP change command
             command = f"configure terminal ; interface mgmt0 ; ip address {new_ip_with_mask} ; exit ; exit"
             print(f"[*] Executing: ip address {new_ip_with_mask}")
 
-            stdin, stdout, stderr = ssh.exec_command(command)
+            stdin, stdout, stderr = ssh.exec_command(command, timeout=30)
             
-            # Wait for command execution
-            time.sleep(2)
+            # Wait only until the command reports completion; the session may
+            # drop instead once mgmt0 moves, so never wait past the old fixed delay
+            channel = stdout.channel
+            deadline = time.monotonic() + _SSH_COMMAND_WAIT
+            while not channel.exit_status_ready() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            if channel.exit_status_ready():
+                exit_status = channel.recv_exit_status()
+                # -1 means the channel closed without a status, i.e. the session dropped
+                if exit_status not in (0, -1):
+                    print(f"Command failed with status {exit_status}: {stderr.read().decode(errors='replace')}")
+                    return False
             
-            ssh.close()
             print("[+] IP address changed successfully")
             return True
             
         except Exception as e:
             print(f"SSH Error: {e}")
             return False
+        finally:
+            if ssh is not None:
+                ssh.close()
     
     def set_switch_freeform(self, fabric_name: str, role: str, switch_name: str) -> bool:
         """Create a freeform policy for switch based on YAML configuration."""
         print(f"[Switch] {self.GREEN}Creating freeform policy for switch {switch_name}{self.END}")
 
-        switch_data = self._load_switch_config(fabric_name, role, switch_name)
-        if not switch_data:
+        ctx = self._resolve(fabric_name, role, switch_name)
+        if not ctx:
             return False
+        serial_number = ctx.serial
         
-        serial_number = switch_data.get("Serial Number")
-        if not serial_number:
-            print(f"[Switch] Error: Serial Number not found in {switch_name} configuration")
-            return False
-        
-        freeform_config_paths = switch_data.get("Switch Freeform Config")
+        freeform_config_paths = ctx.data.get("Switch Freeform Config")
         if not freeform_config_paths:
             print(f"[Switch] Switch Freeform Config not found in {switch_name} configuration, skipping freeform policy creation")
             return False
@@ -295,18 +387,16 @@ class SwitchManager:
         """Parse freeform configuration file and return CLI commands."""
         # Build the full path to the freeform config file
         # The path is relative to the switch YAML file location
-        switch_dir = self.config_base_path / fabric_name / role
-        config_file_path = switch_dir / freeform_config_path
+        config_file_path = os.path.join(self.config_base_str, fabric_name, role, freeform_config_path)
         
-        print(f"[Switch] Reading freeform config: {config_file_path.name}")
+        print(f"[Switch] Reading freeform config: {os.path.basename(config_file_path)}")
         
         # Use config_utils function to read the freeform config
-        cli_commands = read_freeform_config(str(config_file_path))
+        cli_commands = read_freeform_config(config_file_path)
 
         if "$BGP_ASN" in cli_commands:
-            fabric_dir = self.config_base_path / ".." / "1_vxlan_evpn" / "fabric"
-            fabric_config_path = fabric_dir / f"{fabric_name}.yaml"
-            fabric_config = load_yaml_file(str(fabric_config_path))
+            fabric_config_path = os.path.join(self.config_base_str, "..", "1_vxlan_evpn", "fabric", fabric_name + ".yaml")
+            fabric_config = load_yaml_file(fabric_config_path)
             general = fabric_config.get("General Parameter")
             bgp_asn = general.get("BGP ASN")
             if not bgp_asn:
@@ -321,16 +411,17 @@ class SwitchManager:
         return cli_commands
     
     def _get_switch_password(self) -> Optional[str]:
-        """Get switch password from environment."""
-        from dotenv import load_dotenv
-        script_dir = Path(__file__).resolve().parents[2]
-        env_path = script_dir / "api" / ".env"
-        load_dotenv(env_path)
-        password = os.getenv("SWITCH_PASSWORD")
+        """Get switch password from environment, read once and re-read only while it is missing."""
+        global _SWITCH_PASSWORD
+        if _SWITCH_PASSWORD is None:
+            # The .env file may have been created or filled in since import
+            load_dotenv(_ENV_PATH)
+            _SWITCH_PASSWORD = os.getenv("SWITCH_PASSWORD")
+        password = _SWITCH_PASSWORD
         
         if not password:
             print("Error: SWITCH_PASSWORD not found in environment")
-            print(f"Please check .env file at: {env_path}")
+            print(f"Please check .env file at: {_ENV_PATH}")
         
         return password
     
@@ -338,25 +429,21 @@ class SwitchManager:
         """Change the hostname of a switch by updating the host_11_1 policy."""
         print(f"[Switch] Changing hostname for switch {switch_name} to {new_hostname}")
         
-        switch_data = self._load_switch_config(fabric_name, role, switch_name)
-        if not switch_data:
-            return False
-        
-        serial_number = switch_data.get("Serial Number")
-        if not serial_number:
-            print(f"[Switch] Error: Serial Number not found in {switch_name} configuration")
+        ctx = self._resolve(fabric_name, role, switch_name)
+        if not ctx:
             return False
+        serial_number = ctx.serial
         
         policies = policy_api.get_policies_by_serial_number(serial_number)
         if not policies:
             print(f"[Switch] No policies found for switch {switch_name}")
             return False
         
-        hostname_policy = None
-        for policy in policies:
-            if policy.get("templateName") == "host_11_1" and not policy.get("deleted"):
-                hostname_policy = policy
-                break
+        hostname_policy = next(
+            (policy for policy in policies
+             if policy.get("templateName") == "host_11_1" and not policy.get("deleted")),
+            None
+        )
         
         if not hostname_policy:
             print(f"[Switch] Error: host_11_1 policy not found for switch {switch_name}")
@@ -370,15 +457,10 @@ class SwitchManager:
         
     def rediscover_switch(self, fabric_name: str, role: str, switch_name: str) -> bool:
         """Rediscover a switch by its name."""
-        config = self._load_switch_config(fabric_name, role, switch_name)
-        if not config:
-            print(f"[Switch] Error: Switch {switch_name} configuration not found")
-            return False
-
-        serial_number = config.get("Serial Number")
-        if not serial_number:
-            print(f"[Switch] Error: Serial Number not found in {switch_name} configuration")
+        ctx = self._resolve(fabric_name, role, switch_name)
+        if not ctx:
             return False
+        serial_number = ctx.serial
         
         success = False
         check_interval = 10
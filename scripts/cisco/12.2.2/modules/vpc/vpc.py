@@ -8,11 +8,60 @@ This module provides VPC management functionality including:
 """
 
 import json
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
 import api.vpc as vpc_api
 import api.interface as interface_api
 from modules.config_utils import load_yaml_file
 from config.config_factory import config_factory
 
+# Upper bound on VPC files processed concurrently against NDFC
+_VPC_WORKERS = 16
+
+# nvPairs of a VPC interface policy with their defaults; copied per file and overridden from "Policy Options"
+_VPC_NVPAIR_DEFAULTS = {
+    "PEER1_PCID": "1",
+    "PEER2_PCID": "1",
+    "PC_MODE": "active",
+    "PEER1_MEMBER_INTERFACES": "",
+    "PEER2_MEMBER_INTERFACES": "",
+    "PEER1_ALLOWED_VLANS": "none",
+    "PEER2_ALLOWED_VLANS": "none",
+    "BPDUGUARD_ENABLED": False,
+    "PORTTYPE_FAST_ENABLED": False,
+    "INTF_NAME": ""
+}
+
+# NDFC string form of YAML booleans
+_BOOL_STR = {True: "true", False: "false"}
+
+# YAML "Policy Options" keys and the nvPairs they set
+_VPC_POLICY_OPTIONS = (
+    ("Peer-1 Port-Channel ID", "PEER1_PCID"),
+    ("Peer-2 Port-Channel ID", "PEER2_PCID"),
+    ("Port Channel Mode", "PC_MODE"),
+    ("Peer-1 Member Interfaces", "PEER1_MEMBER_INTERFACES"),
+    ("Peer-2 Member Interfaces", "PEER2_MEMBER_INTERFACES"),
+    ("Peer-1 Trunk Allowed Vlans", "PEER1_ALLOWED_VLANS"),
+    ("Peer-2 Trunk Allowed Vlans", "PEER2_ALLOWED_VLANS"),
+    ("Enable BPDU Guard", "BPDUGUARD_ENABLED"),
+    ("Enable Port Type Fast", "PORTTYPE_FAST_ENABLED")
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_vpc_stem(stem: str) -> Optional[Tuple[str, str, str]]:
+    """Split a VPC filename stem (switch1=switch2=vpc_name) into its parts, or None if malformed."""
+    switch1, sep, rest = stem.partition('=')
+    switch2, sep2, rest = rest.partition('=')
+    if not sep or not sep2:
+        return None
+    return switch1, switch2, rest.partition('=')[0]
+
 
 class VPCManager:
     """Manager class for VPC operations."""
@@ -22,6 +71,13 @@ class VPCManager:
         self.config_paths = config_factory.create_vpc_config()
         self.config_base_path = self.config_paths['configs_dir']
 
+    @staticmethod
+    def _list_vpc_files(vpc_dir: Path) -> list:
+        """Return the YAML files in a VPC directory using a single scandir pass."""
+        with os.scandir(vpc_dir) as entries:
+            return [Path(entry.path) for entry in entries
+                    if entry.name.endswith((".yaml", ".yml")) and entry.is_file()]
+
     def create_vpc_pairs(self, fabric_name: str) -> bool:
         """Create VPC pairs and set policies for all VPC configurations in the specified fabric."""
         try:
@@ -34,7 +90,7 @@ class VPCManager:
                 return False
             
             # Find all YAML files in the VPC directory
-            vpc_files = list(vpc_dir.glob("*.yaml")) + list(vpc_dir.glob("*.yml"))
+            vpc_files = self._list_vpc_files(vpc_dir)
             
             if not vpc_files:
                 print(f"[VPC] No VPC configuration files found in {vpc_dir}")
@@ -42,69 +98,88 @@ class VPCManager:
             
             print(f"[VPC] Found {len(vpc_files)} VPC configuration file(s) in {fabric_name}")
             
-            success_count = 0
-            for vpc_file in vpc_files:
-                print(f"[VPC] Processing VPC configuration: {vpc_file.name}")
-
+            def process_one(vpc_file):
                 # Load VPC configuration
-                vpc_data = load_yaml_file(vpc_file)
+                vpc_data = load_yaml_file(vpc_file, json_sidecar=True)
                 if not vpc_data:
-                    print(f"Failed to load VPC configuration from {vpc_file}")
-                    continue
+                    return vpc_file.name, None, "failed to load configuration", None
                 
                 # Extract peer serial numbers
                 peer_one_id = vpc_data.get("Peer-1 Serial Number")
                 peer_two_id = vpc_data.get("Peer-2 Serial Number")
                 
                 if not peer_one_id or not peer_two_id:
-                    print(f"[VPC] Error: Missing peer serial numbers in {vpc_file.name}")
-                    print(f"[VPC]   Peer-1: {peer_one_id}")
-                    print(f"[VPC]   Peer-2: {peer_two_id}")
-                    continue
-                
-                # Step 1: Create VPC pair via API
-                print(f"[VPC] Step 1: Creating VPC pair for {peer_one_id} and {peer_two_id}")
-                vpc_api.create_vpc_pair(peer_one_id, peer_two_id)
-
-                # Step 2: Set VPC policy if VPC pair was created successfully
-                print(f"[VPC] Step 2: Setting VPC policy for {peer_one_id} and {peer_two_id}")
+                    return vpc_file.name, None, f"missing peer serial numbers (Peer-1: {peer_one_id}, Peer-2: {peer_two_id})", None
+                pair = (peer_one_id, peer_two_id)
 
                 # Extract policy details
                 policy_data = vpc_data.get("Policy", {})
                 if not policy_data:
-                    print(f"[VPC] No policy data found in {vpc_file.name}, skipping policy configuration")
-                    success_count += 1
-                    continue
+                    return vpc_file.name, pair, None, None
                 
                 policy_name = policy_data.get("Name", "int_vpc_trunk_host")
                 policy_data = policy_data.get("Policy Options", {})
                 # Parse VPC name from filename (format: switch1=switch2=vpcname.yaml)
-                filename_without_ext = vpc_file.stem
-                parts = filename_without_ext.split('=')
-                vpc_name = parts[2] if len(parts) >= 3 else filename_without_ext
+                parsed = _parse_vpc_stem(vpc_file.stem)
+                vpc_name = parsed[2] if parsed else vpc_file.stem
                 
-                # Build the policy payload
-                policy_payload = [{
-                        "serialNumber": f"{peer_one_id}~{peer_two_id}",
-                        "interfaceType": "INTERFACE_VPC",
-                        "fabricName": fabric_name,
-                        "ifName": vpc_name,
-                        "nvPairs": {
-                            "PEER1_PCID": str(policy_data.get("Peer-1 Port-Channel ID", "1")),
-                            "PEER2_PCID": str(policy_data.get("Peer-2 Port-Channel ID", "1")),
-                            "PC_MODE": policy_data.get("Port Channel Mode", "active"),
-                            "PEER1_MEMBER_INTERFACES": policy_data.get("Peer-1 Member Interfaces", ""),
-                            "PEER2_MEMBER_INTERFACES": policy_data.get("Peer-2 Member Interfaces", ""),
-                            "PEER1_ALLOWED_VLANS": policy_data.get("Peer-1 Trunk Allowed Vlans", "none"),
-                            "PEER2_ALLOWED_VLANS": policy_data.get("Peer-2 Trunk Allowed Vlans", "none"),
-                            "BPDUGUARD_ENABLED": str(policy_data.get("Enable BPDU Guard", False)).lower(),
-                            "PORTTYPE_FAST_ENABLED": policy_data.get("Enable Port Type Fast", False),
-                            "INTF_NAME": vpc_name
-                        }
-                    }]
-
-                if interface_api.update_interface(policy_name, policy_payload):
+                # Build the policy interface entry
+                nv_pairs = _VPC_NVPAIR_DEFAULTS.copy()
+                for option, key in _VPC_POLICY_OPTIONS:
+                    if option in policy_data:
+                        nv_pairs[key] = policy_data[option]
+                nv_pairs["PEER1_PCID"] = str(nv_pairs["PEER1_PCID"])
+                nv_pairs["PEER2_PCID"] = str(nv_pairs["PEER2_PCID"])
+                bpdu_guard = nv_pairs["BPDUGUARD_ENABLED"]
+                nv_pairs["BPDUGUARD_ENABLED"] = _BOOL_STR[bpdu_guard] if isinstance(bpdu_guard, bool) else str(bpdu_guard).lower()
+                nv_pairs["INTF_NAME"] = vpc_name
+                policy_entry = {
+                    "serialNumber": f"{peer_one_id}~{peer_two_id}",
+                    "interfaceType": "INTERFACE_VPC",
+                    "fabricName": fabric_name,
+                    "ifName": vpc_name,
+                    "nvPairs": nv_pairs
+                }
+                return vpc_file.name, pair, None, (policy_name, policy_entry)
+
+            # Parse all files first; results stay in file order
+            with ThreadPoolExecutor(max_workers=min(_VPC_WORKERS, len(vpc_files))) as executor:
+                results = list(executor.map(process_one, vpc_files))
+
+            # Several files can describe the same peer pair, so create each pair only once
+            pairs = {}
+            for name, pair, error, _ in results:
+                if error:
+                    print(f"[VPC] Error: {name}: {error}")
+                else:
+                    pairs.setdefault(tuple(sorted(pair)), pair)
+            if not pairs:
+                return False
+            with ThreadPoolExecutor(max_workers=min(_VPC_WORKERS, len(pairs))) as executor:
+                created = dict(zip(pairs, executor.map(lambda pair: vpc_api.create_vpc_pair(*pair), pairs.values())))
+
+            success_count = 0
+            policy_batches = defaultdict(list)
+            for name, pair, error, policy in results:
+                if error:
+                    continue
+                pair_created = created[tuple(sorted(pair))]
+                print(f"[VPC] {name}: VPC pair {pair[0]}~{pair[1]} {'created' if pair_created else 'creation failed'} "
+                      f"(policy: {policy[0] if policy else 'none'})")
+                if not pair_created:
+                    # One interface on a missing pair would make NDFC reject the whole batched PUT
+                    if policy:
+                        print(f"[VPC] Skipping {policy[0]} policy for {name}: VPC pair was not created")
+                elif policy:
+                    policy_batches[policy[0]].append(policy[1])
+                else:
                     success_count += 1
+
+            # The interface endpoint accepts many interfaces per policy, so send each policy once
+            for policy_name, interfaces in policy_batches.items():
+                print(f"[VPC] Setting {policy_name} policy on {len(interfaces)} VPC interface(s)")
+                if interface_api.update_interface(policy_name, interfaces):
+                    success_count += len(interfaces)
             
             return success_count > 0
             
@@ -124,7 +199,7 @@ class VPCManager:
                 return False
             
             # Find all YAML files in the VPC directory
-            vpc_files = list(vpc_dir.glob("*.yaml")) + list(vpc_dir.glob("*.yml"))
+            vpc_files = self._list_vpc_files(vpc_dir)
             
             if not vpc_files:
                 print(f"[VPC] No VPC configuration files found in {vpc_dir}")
@@ -134,13 +209,9 @@ class VPCManager:
             matching_files = []
             for vpc_file in vpc_files:
                 # Parse filename format: {switchname1}={switchname2}={vpc_name}.yaml
-                filename_without_ext = vpc_file.stem
-                if '=' in filename_without_ext:
-                    parts = filename_without_ext.split('=')
-                    if len(parts) >= 3:  # Need at least 3 parts: switch1, switch2, vpc_name
-                        switch1, switch2, vpc_name = parts[0], parts[1], parts[2]
-                        if switch_name in [switch1, switch2]:
-                            matching_files.append((vpc_file, switch1, switch2, vpc_name))
+                parsed = _parse_vpc_stem(vpc_file.stem)
+                if parsed and switch_name in parsed[:2]:
+                    matching_files.append((vpc_file, *parsed))
             
             if not matching_files:
                 print(f"[VPC] No VPC configuration files found containing switch '{switch_name}' in {fabric_name}")
@@ -148,57 +219,59 @@ class VPCManager:
 
             print(f"[VPC] Found {len(matching_files)} VPC configuration file(s) containing switch '{switch_name}' in {fabric_name}")
 
-            success_count = 0
-            for vpc_file, switch1, switch2, vpc_name in matching_files:
-                print(f"[VPC] Processing VPC configuration: {vpc_file.name}")
-
+            def process_one(vpc_file, switch1, switch2, vpc_name):
                 # Load VPC configuration
-                vpc_data = load_yaml_file(vpc_file)
+                vpc_data = load_yaml_file(vpc_file, json_sidecar=True)
                 if not vpc_data:
-                    print(f"[VPC] Failed to load VPC configuration from {vpc_file}")
-                    continue
+                    return vpc_file.name, None, "failed to load configuration"
                 
                 # Extract peer serial numbers
                 peer_one_serial = vpc_data.get("Peer-1 Serial Number")
                 peer_two_serial = vpc_data.get("Peer-2 Serial Number")
                 
                 if not peer_one_serial or not peer_two_serial:
-                    print(f"[VPC] Error: Missing peer serial numbers in {vpc_file.name}")
-                    print(f"[VPC]   Peer-1: {peer_one_serial}")
-                    print(f"[VPC]   Peer-2: {peer_two_serial}")
-                    continue
+                    return vpc_file.name, None, f"missing peer serial numbers (Peer-1: {peer_one_serial}, Peer-2: {peer_two_serial})"
                 
                 # Determine which serial number corresponds to the target switch
                 target_serial = None
                 if switch_name == switch1:
                     target_serial = peer_one_serial
-                    print(f"[VPC] Target switch '{switch_name}' matches Peer-1: {peer_one_serial}")
                 elif switch_name == switch2:
                     target_serial = peer_two_serial
-                    print(f"[VPC] Target switch '{switch_name}' matches Peer-2: {peer_two_serial}")
 
                 if not target_serial:
-                    print(f"[VPC] Error: Could not determine serial number for switch '{switch_name}'")
-                    continue
+                    return vpc_file.name, None, f"could not determine serial number for switch '{switch_name}'"
                 
                 # Create serial numbers string for policy deletion
                 serial_numbers = f"{peer_one_serial}~{peer_two_serial}"
-                
-                print(f"[VPC] Deleting VPC policy and pair for switch '{switch_name}':")
-                print(f"[VPC]  VPC Name: {vpc_name}")
-                print(f"[VPC]  Target Serial: {target_serial}")
-                print(f"[VPC]  Serial Numbers: {serial_numbers}")
-
-                # Step 1: Delete VPC policy first
-                print(f"[VPC] Step 1: Deleting VPC policy for {vpc_name}...")
-                interface_api.delete_interfaces([{
-                    "ifName": vpc_name,
-                    "serialNumber": serial_numbers
-                }])
-                
-                # Step 2: Delete VPC pair
-                print(f"[VPC] Step 2: Deleting VPC pair with serial number {target_serial}...")
-                if vpc_api.delete_vpc_pair(target_serial):
+                return vpc_file.name, ({"ifName": vpc_name, "serialNumber": serial_numbers}, target_serial), None
+
+            # Parse all matching files first; results stay in file order
+            with ThreadPoolExecutor(max_workers=min(_VPC_WORKERS, len(matching_files))) as executor:
+                results = list(executor.map(lambda match: process_one(*match), matching_files))
+
+            targets = []
+            for name, target, error in results:
+                if error:
+                    print(f"[VPC] Error: {name}: {error}")
+                else:
+                    targets.append(target)
+
+            if not targets:
+                return False
+
+            # Step 1: Delete all VPC policies in one call before removing the pairs
+            print(f"[VPC] Deleting {len(targets)} VPC policy(ies) before removing the pairs")
+            interface_api.delete_interfaces([interface for interface, _ in targets])
+
+            # Step 2: Delete VPC pairs; files sharing a peer pair resolve to the same serial, so delete each once
+            target_serials = list(dict.fromkeys(serial for _, serial in targets))
+            with ThreadPoolExecutor(max_workers=min(_VPC_WORKERS, len(target_serials))) as executor:
+                deleted = list(executor.map(vpc_api.delete_vpc_pair, target_serials))
+            success_count = 0
+            for target_serial, ok in zip(target_serials, deleted):
+                print(f"[VPC] VPC pair with serial number {target_serial}: {'deleted' if ok else 'deletion failed'}")
+                if ok:
                     success_count += 1
             
             return success_count > 0
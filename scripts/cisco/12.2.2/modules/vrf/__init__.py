@@ -13,7 +13,7 @@ with a single VRFManager class that handles all VRF operations.
 """
 
 # Import the unified VRF manager
-from .vrf import VRFManager
+from .vrf import VRFManager, get_vrf_manager
 
-# Export the VRF manager for external use
-__all__ = ['VRFManager']
+# Export the VRF manager class and shared instance for external use
+__all__ = ['VRFManager', 'get_vrf_manager']
@@ -10,13 +10,14 @@ This module provides a clean, unified interface for all VRF operations with:
 - VRF attachment/detachment to switch interfaces
 """
 
-from multiprocessing import process
-from pickle import NONE
 from typing import List, Dict, Any, Tuple, Optional
-from modules.config_utils import load_yaml_file, validate_configuration_files, merge_configs, apply_field_mapping, flatten_config
+from modules.config_utils import load_yaml_file, validate_configuration_files, merge_configs, flatten_and_map, flatten_config, index_by_name_and_fabric
 from config.config_factory import config_factory
 import api.vrf as vrf_api
-import json
+
+# Fallback VRF templates when the corp defaults do not name one
+_DEFAULT_VRF_TEMPLATE = "Default_VRF_Universal"
+_DEFAULT_VRF_EXTENSION_TEMPLATE = "Default_VRF_Extension_Universal"
 
 class VRFManager:
     """Unified VRF operations manager with YAML configuration support."""
@@ -33,9 +34,12 @@ class VRFManager:
         self.field_mapping_path = config_paths.field_mapping_path
         
         # Lazy-loaded cached configurations
-        self._defaults = None
-        self._field_mapping = None
         self._vrfs = None
+        self._by_name = {}
+        self._by_fabric = {}
+        # Flattened field mapping and the parsed mapping it was built from
+        self._flat_mapping = None
+        self._flat_mapping_source = None
 
         self.GREEN = '\033[92m'
         self.YELLOW = '\033[93m'
@@ -44,31 +48,52 @@ class VRFManager:
 
     @property
     def defaults(self) -> Dict[str, Any]:
-        """Get corp defaults with lazy loading."""
-        if self._defaults is None:
-            self._defaults = load_yaml_file(str(self.defaults_path))
-        return self._defaults
+        """Get corp defaults from the load_yaml_file cache."""
+        return load_yaml_file(str(self.defaults_path))
     
     @property
     def field_mapping(self) -> Dict[str, Any]:
-        """Get field mapping with lazy loading."""
-        if self._field_mapping is None:
-            self._field_mapping = load_yaml_file(str(self.field_mapping_path))
-        return self._field_mapping
+        """Get field mapping from the load_yaml_file cache."""
+        return load_yaml_file(str(self.field_mapping_path))
+    
+    def _get_flat_mapping(self) -> Dict[str, Any]:
+        """Flatten the field mapping, redoing it only after load_yaml_file re-parses the file."""
+        field_mapping = self.field_mapping
+        if field_mapping is not self._flat_mapping_source:
+            self._flat_mapping = flatten_config(field_mapping)
+            self._flat_mapping_source = field_mapping
+        return self._flat_mapping
     
     @property
     def vrfs(self) -> List[Dict[str, Any]]:
         """Get VRF configurations with lazy loading and caching."""
         if self._vrfs is None:
-            try:
-                # print(f"[VRF] Loading VRF config from: {self.config_path}")
-                config_data = load_yaml_file(str(self.config_path))
-                self._vrfs = config_data.get('VRF', [])
-            except Exception as e:
-                print(f"Error loading VRF configuration: {e}")
-                self._vrfs = []
+            self._load_vrfs()
         return self._vrfs
     
+    def _load_vrfs(self) -> None:
+        """Load VRF configurations from YAML file."""
+        try:
+            # print(f"[VRF] Loading VRF config from: {self.config_path}")
+            config_data = load_yaml_file(str(self.config_path))
+            self._vrfs = config_data.get('VRF', [])
+        except Exception as e:
+            print(f"Error loading VRF configuration: {e}")
+            self._vrfs = []
+        self._by_name, self._by_fabric = index_by_name_and_fabric(self._vrfs, 'VRF Name')
+    
+    def fabric_vrfs(self, fabric_name: str) -> Tuple[Dict[str, Any], ...]:
+        """Get the YAML VRFs of a fabric from the index built at load time."""
+        if self._vrfs is None:
+            self._load_vrfs()
+        return self._by_fabric.get(fabric_name, ())
+    
+    def _get_vrf(self, vrf_name: str) -> Optional[Dict[str, Any]]:
+        """Find VRF by name regardless of fabric."""
+        if self._vrfs is None:
+            self._load_vrfs()
+        return self._by_name.get(vrf_name)
+    
     def _validate_resources(self) -> None:
         """Validate required resource files exist."""
         validate_configuration_files([str(self.defaults_path), str(self.field_mapping_path)])
@@ -80,39 +105,33 @@ class VRFManager:
         vlan_id = str(vrf.get('VLAN ID', 0))
         general_params = vrf.get('General Parameters', {})
         
-        # Build base template config
-        template_config = {
+        # Build template config: base fields, then corp defaults with field mapping on top
+        return {
             "vrfName": vrf_name,
             "vrfSegmentId": vrf_id,
             "vrfVlanId": vlan_id,
             "vrfDescription": general_params.get("VRF Description", vrf_name),
             "vrfVlanName": general_params.get("VRF VLAN Name", vrf_name),
             "vrfIntfDescription": general_params.get("VRF Interface Description", vrf_name),
+            **self._get_template_defaults(vrf),
         }
-        
-        # Apply corp defaults with field mapping
-        self._apply_template_defaults(template_config, vrf)
-        
-        return template_config
     
-    def _apply_template_defaults(self, template_config: Dict[str, Any], vrf: Dict[str, Any]) -> None:
-        """Apply corp defaults with field mapping to template config."""
-        # Merge VRF config with defaults
+    def _get_template_defaults(self, vrf: Dict[str, Any]) -> Dict[str, Any]:
+        """Get corp defaults merged with the VRF config and field mapped, keeping only non-empty values."""
+        # Merge VRF config with defaults; sections the VRF leaves empty or unchanged reuse the defaults as-is
         final_config = {}
-        for key in self.defaults:
-            if key in vrf:
-                final_config[key] = merge_configs(self.defaults[key], vrf[key])
+        for key, default in self.defaults.items():
+            override = vrf.get(key)
+            if not override or override == default:
+                final_config[key] = default
             else:
-                final_config[key] = self.defaults[key]
+                final_config[key] = merge_configs(default, override)
         
-        # Flatten and apply field mapping
-        flat_config = flatten_config(final_config)
-        mapped_config = apply_field_mapping(flat_config, flatten_config(self.field_mapping))
+        # Flatten and apply field mapping in one pass
+        mapped_config = flatten_and_map(final_config, self._get_flat_mapping())
         
-        # Update template config with mapped values
-        for key, value in mapped_config.items():
-            if value:  # Only add non-empty values
-                template_config[key] = value
+        # Only non-empty values override the template config
+        return {key: value for key, value in mapped_config.items() if value}
     
     def _build_vrf_payload(self, fabric_name: str, vrf_name: str, vrf: Dict[str, Any]) -> Dict[str, Any]:
         """Build VRF payload dictionary."""
@@ -120,13 +139,14 @@ class VRFManager:
         vrf_id = vrf.get('VRF ID', 0)
         vlan_id = vrf.get('VLAN ID', 0)
         general_params = vrf.get('General Parameters', {})
+        defaults = self.defaults
         
         # Build base payload
         payload = {
             "fabric": fabric_name,
             "vrfName": vrf_name,
-            "vrfTemplate": self.defaults.get("vrfTemplate", "Default_VRF_Universal"),
-            "vrfExtensionTemplate": self.defaults.get("vrfExtensionTemplate", "Default_VRF_Extension_Universal"),
+            "vrfTemplate": defaults.get("vrfTemplate", _DEFAULT_VRF_TEMPLATE),
+            "vrfExtensionTemplate": defaults.get("vrfExtensionTemplate", _DEFAULT_VRF_EXTENSION_TEMPLATE),
             "vrfId": str(vrf_id),
             "vrfVlanId": str(vlan_id),
             "vrfDescription": general_params.get("VRF Description", vrf_name),
@@ -138,10 +158,7 @@ class VRFManager:
         """Build complete VRF payload for API operations."""
         self._validate_resources()
         
-        for item in self.vrfs:
-            if item.get('VRF Name') == vrf_name:
-                vrf = item
-                break
+        vrf = self._get_vrf(vrf_name)
         if not vrf:
             raise ValueError(f"VRF '{vrf_name}' not found in configuration")
         
@@ -184,7 +201,7 @@ class VRFManager:
             existing_vrf_names = {vrf.get('vrfName') for vrf in existing_vrfs}
             
             # Get VRFs from YAML config for this fabric
-            fabric_vrfs = [vrf for vrf in self.vrfs if vrf.get('Fabric') == fabric_name]
+            fabric_vrfs = self.fabric_vrfs(fabric_name)
             yaml_vrf_names = {vrf.get('VRF Name') for vrf in fabric_vrfs}
             
             # Find VRFs to delete (exist in fabric but not in YAML)
@@ -285,10 +302,11 @@ class VRFManager:
                 print(f"[VRF] No serial number found for switch '{switch_name}'")
                 return False
 
-            for vrf in self.vrfs:
-                if vrf.get('VRF Name') == vrf_name:
-                    vlan_id = vrf.get('VLAN ID', -1)
-                    break
+            vrf = self._get_vrf(vrf_name)
+            if not vrf:
+                print(f"[VRF] VRF '{vrf_name}' not found in configuration")
+                return False
+            vlan_id = vrf.get('VLAN ID', -1)
 
             payload = self._build_vrf_attachment_payload([{
                     'fabric_name': fabric_name,
@@ -445,4 +463,14 @@ class VRFManager:
             payload.append(vrf_payload)
             # print(f"[VRF] Added VRF '{item.get('vrf_name')}' on switch (SN: {item.get('serial_number')}, VLAN: {item.get('vlan_id')}) to {'attach' if item.get('deployment') else 'detach'} payload")
 
-        return payload
\ No newline at end of file
+        return payload
+
+# build.py and vrf_cli.py share this manager, so vrf.yaml is indexed once per run
+_vrf_manager: Optional[VRFManager] = None
+
+def get_vrf_manager() -> VRFManager:
+    """Get the shared VRFManager, building it on the first call."""
+    global _vrf_manager
+    if _vrf_manager is None:
+        _vrf_manager = VRFManager()
+    return _vrf_manager
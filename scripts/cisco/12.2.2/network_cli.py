@@ -13,7 +13,7 @@ from pathlib import Path
 # Setup module path
 sys.path.append(str(Path(__file__).parent.absolute()))
 
-from modules.network import NetworkManager
+from modules.network import get_network_manager
 
 def main():
     """Main CLI entry point."""
@@ -77,8 +77,8 @@ Examples:
         return
     
     try:
-        # Create a single NetworkManager instance for all operations
-        network_manager = NetworkManager()
+        # Use the shared NetworkManager instance for all operations
+        network_manager = get_network_manager()
         
         if args.command == 'create':
             success = network_manager.create_network(args.fabric_name, args.network_name)
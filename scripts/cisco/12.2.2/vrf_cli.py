@@ -21,7 +21,7 @@ import os
 # Add the modules directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'modules'))
 
-from modules.vrf import VRFManager
+from modules.vrf import get_vrf_manager
 
 
 def main():
@@ -89,7 +89,7 @@ Examples:
         return
     
     # Initialize VRF Manager
-    vrf_manager = VRFManager()
+    vrf_manager = get_vrf_manager()
     
     try:
         success = False